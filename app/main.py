@@ -14,8 +14,10 @@ Features:
 """
 import json
 import asyncio
+import threading
+from contextlib import AsyncExitStack
+
 import streamlit as st
-from langchain_mcp_adapters.client import MultiServerMCPClient
 
 
 
@@ -25,6 +27,7 @@ from langchain_mcp_adapters.client import MultiServerMCPClient
 DEFAULTS = {
     "mcp_client": None,
     "tools_obj": {},
+    "tool_servers": {},
     "current_screen": "Dashboard",
     "theme": "light",
     "button_color": "#4CAF50",
@@ -40,19 +43,37 @@ for k, v in DEFAULTS.items():
 
 
 # ------------------------
-# Theme
+# Async Event Loop
 # ------------------------
-def apply_theme():
+class AsyncLoopThread:
     """
-    Apply the selected theme and button color dynamically to the Streamlit app.
-    Supports 'light' and 'dark' themes and updates button styling.
+    Own a single long-lived asyncio event loop running in a daemon thread.
+    Dispatching coroutines onto one shared loop avoids creating and tearing
+    down a fresh loop (and re-initializing MCP transports) on every
+    Streamlit interaction, and lets multiple sessions run MCP calls
+    concurrently on the same loop.
     """
-    button_color = st.session_state.button_color
-    bg = "#111" if st.session_state.theme == "dark" else "#fff"
-    fg = "#eee" if st.session_state.theme == "dark" else "#000"
 
-    st.markdown(
-        f"""
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        """Run a coroutine on the shared loop and block until its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+@st.cache_resource
+def get_loop_thread():
+    """Return the shared AsyncLoopThread (one per Streamlit server process)."""
+    return AsyncLoopThread()
+
+
+# ------------------------
+# Theme
+# ------------------------
+THEME_CSS_TEMPLATE = """
         <style>
         body {{ background-color: {bg}; color: {fg}; }}
         .stButton>button {{
@@ -66,49 +87,363 @@ def apply_theme():
             background-color: #3e8e41;
         }}
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+
+@st.cache_data
+def theme_css(theme, button_color):
+    """Build the <style> block for a (theme, color) pair, cached across reruns."""
+    bg = "#111" if theme == "dark" else "#fff"
+    fg = "#eee" if theme == "dark" else "#000"
+    return THEME_CSS_TEMPLATE.format(bg=bg, fg=fg, button_color=button_color)
+
+
+def apply_theme():
+    """
+    Apply the selected theme and button color dynamically to the Streamlit app.
+    Supports 'light' and 'dark' themes and updates button styling. The CSS is
+    injected at most once per run for a given (theme, color) pair; main()
+    resets the marker each run since un-reemitted elements are dropped.
+    """
+    key = (st.session_state.theme, st.session_state.button_color)
+    if st.session_state.get("_theme_key") == key:
+        return
+    st.markdown(theme_css(*key), unsafe_allow_html=True)
+    st.session_state._theme_key = key
 
 
 # ------------------------
 # Server Connection
 # ------------------------
-def connect_to_servers():
+def servers_key():
+    """Hashable cache key for the currently configured servers."""
+    return tuple(sorted((s["url"], s["transport"]) for s in st.session_state.servers))
+
+
+@st.cache_resource
+def get_client(key):
+    """Return a cached MultiServerMCPClient for the given server config key."""
+    # Imported on first connect so cold start and pre-connect reruns don't
+    # pay for the langchain stack.
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+
+    return MultiServerMCPClient({
+        name: {"url": url, "transport": transport}
+        for name, (url, transport) in zip(server_names(key), key)
+    })
+
+
+def server_names(key):
+    """Per-server names used in the client config for the given key."""
+    return [f"s{i}" for i in range(len(key))]
+
+
+async def discover_tools(client, names):
+    """Fan out per-server get_tools() calls concurrently on the shared loop."""
+    return await asyncio.gather(
+        *(client.get_tools(server_name=name) for name in names),
+        return_exceptions=True,
+    )
+
+
+def preload_tools():
     """
-    Connect to all configured MCP servers, fetch tools from each, and
-    populate st.session_state.tools_obj with a unified tool list.
-    Displays Streamlit messages for success, warnings, and errors.
+    Kick off tool discovery in the background when the server list changes,
+    so the eventual Connect click usually finds the result already done.
+    Called from the connection screen on every rerun; only a changed config
+    submits new work.
+    """
+    key = servers_key()
+    if "last_servers_key" not in st.session_state:
+        # First render: record the baseline config but keep cold start free
+        # of the langchain import and discovery work.
+        st.session_state.last_servers_key = key
+        return
+    if st.session_state.last_servers_key == key:
+        return
+    st.session_state.last_servers_key = key
+    future = asyncio.run_coroutine_threadsafe(
+        discover_tools(get_client(key), server_names(key)), get_loop_thread().loop)
+    st.session_state.discovery_future = (key, future)
+
+
+@st.cache_resource(ttl=300)
+def get_tools_cached(key):
+    """
+    Discover tools from all configured servers concurrently and cache the
+    result for 5 minutes. Returns (tools, tool_servers, failures) where
+    failures holds (url, error) pairs for servers that could not be
+    reached. Uses cache_resource because tool objects are not picklable.
+    A pending background discovery for the same key (see preload_tools)
+    is consumed instead of rediscovering.
     """
-    servers_dict = {
-        f"server_{i + 1}": {"url": s["url"], "transport": s["transport"]}
-        for i, s in enumerate(st.session_state.servers)
-    }
+    names = server_names(key)
 
-    client = MultiServerMCPClient(servers_dict)
-    st.session_state.mcp_client = client
+    pending = st.session_state.pop("discovery_future", None)
+    if pending is not None and pending[0] == key:
+        results = pending[1].result(timeout=60)
+    else:
+        results = get_loop_thread().run(discover_tools(get_client(key), names))
+
+    tools, tool_servers, failures = [], {}, []
+    for name, (url, _transport), result in zip(names, key, results):
+        if isinstance(result, Exception):
+            failures.append((url, result))
+        else:
+            tools.extend(result)
+            tool_servers.update({t.name: name for t in result})
+    return tools, tool_servers, failures
+
+
+class SessionPool:
+    """
+    Keep one warm MCP ClientSession per server so tool calls reuse an
+    already-initialized session instead of paying transport setup on every
+    invocation. Session contexts are opened on the shared loop and held in
+    an AsyncExitStack for the lifetime of the pool.
+    """
 
-    all_tools = []
-    for server_name in servers_dict.keys():
+    def __init__(self, client):
+        self._client = client
+        self._stack = AsyncExitStack()
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session(self, server_name):
+        """Return the warm ClientSession for server_name, opening it on first use."""
+        with self._lock:
+            if server_name not in self._sessions:
+                self._sessions[server_name] = get_loop_thread().run(
+                    self._stack.enter_async_context(self._client.session(server_name))
+                )
+            return self._sessions[server_name]
+
+    def call_tool(self, server_name, tool_name, arguments):
+        """Invoke tool_name with arguments on the warm session for server_name."""
+        session = self.session(server_name)
         try:
-            tools = asyncio.run(client.get_tools())
-            all_tools.extend(tools)
-        except Exception as err:
-            st.warning(f"⚠️ Failed to load tools from {servers_dict[server_name]['url']}: {err}")
+            return get_loop_thread().run(session.call_tool(tool_name, arguments))
+        except Exception:
+            # Drop the broken session so the next call reconnects fresh.
+            with self._lock:
+                self._sessions.pop(server_name, None)
+            raise
+
+
+@st.cache_resource
+def get_session_pool(key):
+    """Return the cached SessionPool for the given server config key."""
+    return SessionPool(get_client(key))
+
+
+def tool_result_payload(call_result):
+    """
+    Flatten an MCP CallToolResult into the shapes the dashboard renders:
+    a single string for one text block, otherwise a list of text payloads.
+    Raises RuntimeError when the server flags the call as an error.
+    """
+    texts = [c.text for c in call_result.content if getattr(c, "text", None) is not None]
+    if call_result.isError:
+        raise RuntimeError("; ".join(texts) or "Tool call failed.")
+    if len(texts) == 1:
+        return texts[0]
+    return texts
+
+
+def sync_servers_from_widgets():
+    """
+    Pull the latest URL/transport widget values into st.session_state.servers.
+    Button callbacks run before the render loop re-syncs the list, so a URL
+    edited in the same interaction as the click would otherwise be read stale.
+    """
+    for i, server in enumerate(st.session_state.servers):
+        if f"server_url_{i}" in st.session_state:
+            server["url"] = st.session_state[f"server_url_{i}"]
+        if f"server_transport_{i}" in st.session_state:
+            server["transport"] = st.session_state[f"server_transport_{i}"]
+
+
+def connect_to_servers():
+    """
+    Connect to all configured MCP servers, fetch tools from each, and
+    populate st.session_state.tools_obj with a unified tool list. Runs as
+    the Connect button's on_click callback, so the natural rerun after the
+    click already renders the dashboard — no explicit st.rerun needed.
+    Messages are stashed in session state and flashed on the next frame.
+    """
+    sync_servers_from_widgets()
+    key = servers_key()
+    st.session_state.mcp_client = get_client(key)
+
+    all_tools, tool_servers, failures = get_tools_cached(key)
+    if failures or not all_tools:
+        # Never keep failed discoveries: clear this key so the next click
+        # retries instead of replaying the failure for the whole TTL.
+        get_tools_cached.clear(key)
+    messages = [
+        ("warning", f"⚠️ Failed to load tools from {url}: {err}") for url, err in failures
+    ]
 
     if not all_tools:
-        st.error("No tools found from any MCP server.")
+        messages.append(("error", "No tools found from any MCP server."))
     else:
         st.session_state.tools_obj = {t.name: t for t in all_tools}
+        st.session_state.tool_servers = tool_servers
         st.session_state.connected = True
         st.session_state.current_screen = "Dashboard"
-        st.success(f"✅ Connected to {len(servers_dict)} servers, total tools: {len(all_tools)}")
-        st.rerun()
+        messages.append(
+            ("success", f"✅ Connected to {len(key)} servers, total tools: {len(all_tools)}"))
+    st.session_state.connect_messages = messages
+
+
+def flash_connect_messages():
+    """Render and clear any messages stashed by connect_to_servers."""
+    for level, text in st.session_state.pop("connect_messages", []):
+        getattr(st, level)(text)
+
+
+def add_server():
+    """Append a new default server row (Add button's on_click callback)."""
+    st.session_state.servers.append({"url": "http://127.0.0.1:8000/mcp",
+                                     "transport": "streamable_http"})
+
+
+def remove_server(index):
+    """
+    Remove the server row at index (Remove button's on_click callback).
+    Running as a callback means the list is mutated between reruns, never
+    while the render loop is iterating it.
+    """
+    if index < len(st.session_state.servers):
+        st.session_state.servers.pop(index)
 
 
 # ------------------------
 # Dashboard
 # ------------------------
+MAX_RESULT_ROWS = 500
+
+# Input widget per JSON-schema type; unknown types fall back to "string".
+WIDGET_DISPATCH = {
+    "string": lambda label: st.text_input(label, value=""),
+    "integer": lambda label: st.number_input(label, value=0, step=1),
+    "number": lambda label: st.number_input(label, value=0.0),
+    "boolean": lambda label: st.checkbox(label, value=False),
+}
+
+
+def show_result_rows(rows):
+    """
+    Display up to MAX_RESULT_ROWS rows, offering the full result as a
+    Parquet download when it is larger, so the payload sent to the
+    browser stays bounded regardless of tool output size. Rows are
+    converted to a pyarrow Table up front: columnar serialization to the
+    browser skips the per-row dict conversion cost entirely.
+    """
+    import io
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    try:
+        if rows and not isinstance(rows[0], dict):
+            table = pa.table({"raw": [str(r) for r in rows]})
+        else:
+            table = pa.Table.from_pylist(rows)
+    except (TypeError, pa.ArrowInvalid, pa.ArrowTypeError):
+        # Ragged rows Arrow can't type; let Streamlit coerce the plain list.
+        st.dataframe(rows[:MAX_RESULT_ROWS])
+        if len(rows) > MAX_RESULT_ROWS:
+            st.caption(f"Showing first {MAX_RESULT_ROWS} of {len(rows)} rows.")
+        return
+
+    st.dataframe(table.slice(0, MAX_RESULT_ROWS))
+    if table.num_rows > MAX_RESULT_ROWS:
+        st.caption(f"Showing first {MAX_RESULT_ROWS} of {table.num_rows} rows.")
+        buf = io.BytesIO()
+        pq.write_table(table, buf)
+        st.download_button("⬇️ Download full result", buf.getvalue(), "result.parquet")
+
+
+@st.cache_data
+def prepare_form(tool_name, schema_json):
+    """
+    Precompute (field, type, required) rows for a tool's input form so
+    reruns don't re-parse the schema on every keystroke. Keyed on the
+    tool name plus its serialized schema.
+    """
+    schema = json.loads(schema_json)
+    required = set(schema.get("required", []))
+    return [
+        (field, meta.get("type", "string"), field in required)
+        for field, meta in schema.get("properties", {}).items()
+    ]
+
+
+@st.fragment
+def render_dashboard_body():
+    """
+    Dashboard body isolated in a fragment: tool selection and form submits
+    rerun only this section instead of the whole app (sidebar, theme, etc).
+    """
+    tool_name = st.selectbox("Select MCP Tool", list(st.session_state.tools_obj.keys()))
+    tool_obj = st.session_state.tools_obj[tool_name]
+
+    st.markdown("### Tool Input Form")
+    input_dict = {}
+    form_fields = prepare_form(tool_name, json.dumps(tool_obj.args_schema, sort_keys=True))
+
+    # Batch inputs in a form so typing doesn't rerun the script per keystroke
+    with st.form("tool_form"):
+        if form_fields:
+            # One dataframe instead of three column-writes per field keeps
+            # the schema table to a single message to the browser.
+            st.markdown("#### 🧾 Tool Input Fields:")
+            st.dataframe(
+                [
+                    {"Field Name": f, "Type": t, "Required": "✅" if r else "❌"}
+                    for f, t, r in form_fields
+                ],
+                hide_index=True,
+            )
+
+            for field, field_type, is_required in form_fields:
+                label = f"{field} ({field_type}) {'*' if is_required else ''}"
+                widget = WIDGET_DISPATCH.get(field_type, WIDGET_DISPATCH["string"])
+                input_dict[field] = widget(label)
+
+        st.markdown("---")
+        submitted = st.form_submit_button("Run Tool")
+
+    if submitted:
+        import orjson
+
+        try:
+            # Call the warm session directly: no pydantic re-validation or
+            # Runnable dispatch on the adapter's per-invoke path.
+            server_name = st.session_state.tool_servers[tool_name]
+            pool = get_session_pool(servers_key())
+            result = tool_result_payload(
+                pool.call_tool(server_name, tool_name, input_dict))
+
+            # Display results cleanly
+            if isinstance(result, list):
+                try:
+                    # Single pass over the rows; bails out on the first
+                    # element that is not a JSON string.
+                    parsed_rows = [orjson.loads(r) for r in result]
+                except (TypeError, orjson.JSONDecodeError):
+                    parsed_rows = result
+                show_result_rows(parsed_rows)
+            elif isinstance(result, dict):
+                st.dataframe(result)
+            else:
+                with st.expander("🧾 Tool Output", expanded=True):
+                    st.text(str(result))
+        except Exception as e:
+            st.error(f"Error running tool: {e}")
+
+
 def render_dashboard():
     """
     Render the main dashboard UI where users can:
@@ -119,67 +454,7 @@ def render_dashboard():
     st.title("🧩 Dashboard")
 
     if st.session_state.tools_obj:
-        tool_name = st.selectbox("Select MCP Tool", list(st.session_state.tools_obj.keys()))
-        tool_obj = st.session_state.tools_obj[tool_name]
-
-        st.markdown("### Tool Input Form")
-        input_dict = {}
-        properties = tool_obj.args_schema.get("properties", {})
-        required_fields = tool_obj.args_schema.get("required", [])
-
-        # Pretty display for input schema
-        if properties:
-            st.markdown("#### 🧾 Tool Input Fields:")
-            cols = st.columns([2, 2, 1])
-            cols[0].markdown("**Field Name**")
-            cols[1].markdown("**Type**")
-            cols[2].markdown("**Required**")
-            for field, meta in properties.items():
-                cols = st.columns([2, 2, 1])
-                cols[0].write(field)
-                cols[1].write(meta.get("type", "string"))
-                cols[2].write("✅" if field in required_fields else "❌")
-
-        st.markdown("---")
-
-        # Dynamic input generation
-        for field, meta in properties.items():
-            field_type = meta.get("type", "string")
-            default_value = "" if field_type == "string" else 0
-            label = f"{field} ({field_type}) {'*' if field in required_fields else ''}"
-
-            if field_type == "string":
-                value = st.text_input(label, value=str(default_value))
-            elif field_type == "integer":
-                value = st.number_input(label, value=int(default_value), step=1)
-            elif field_type == "number":
-                value = st.number_input(label, value=float(default_value))
-            elif field_type == "boolean":
-                value = st.checkbox(label, value=False)
-            else:
-                value = st.text_input(label, value=str(default_value))
-            input_dict[field] = value
-
-        if st.button("Run Tool"):
-            try:
-                result = asyncio.run(tool_obj.ainvoke(input_dict))
-
-                # Display results cleanly
-                if isinstance(result, list) and all(isinstance(r, str) for r in result):
-                    parsed_rows = []
-                    for r in result:
-                        try:
-                            parsed_rows.append(json.loads(r))
-                        except Exception:
-                            parsed_rows.append({"raw": r})
-                    st.dataframe(parsed_rows)
-                elif isinstance(result, (dict, list)):
-                    st.dataframe(result)
-                else:
-                    with st.expander("🧾 Tool Output", expanded=True):
-                        st.text(str(result))
-            except Exception as e:
-                st.error(f"Error running tool: {e}")
+        render_dashboard_body()
     else:
         st.info("No tools found. Please check the MCP connection.")
 
@@ -254,6 +529,8 @@ def main():
         initial_sidebar_state="collapsed",
     )
 
+    # New frame: the previous frame's CSS element is gone, so re-inject once.
+    st.session_state._theme_key = None
     apply_theme()
 
     if not st.session_state.connected:
@@ -277,20 +554,20 @@ def main():
                     key=f"server_transport_{i}",
                 )
                 if len(st.session_state.servers) > 1:
-                    if st.button(f"❌ Remove Server {i + 1}", key=f"remove_server_{i}"):
-                        st.session_state.servers.pop(i)
-                        st.rerun()
+                    st.button(f"❌ Remove Server {i + 1}", key=f"remove_server_{i}",
+                              on_click=remove_server, args=(i,))
 
-            if st.button("➕ Add Another MCP Server"):
-                st.session_state.servers.append({"url": "http://127.0.0.1:8000/mcp",
-                                                 "transport": "streamable_http"})
-                st.rerun()
+            # Warm up discovery in the background while the user finishes editing
+            preload_tools()
 
-            if st.button("Connect to All", key="connect_btn"):
-                connect_to_servers()
+            st.button("➕ Add Another MCP Server", on_click=add_server)
+            st.button("Connect to All", key="connect_btn", on_click=connect_to_servers)
 
+            flash_connect_messages()
             st.markdown("</div>", unsafe_allow_html=True)
     else:
+        flash_connect_messages()
+
         # Sidebar menu
         with st.sidebar:
             st.markdown("## Menu")